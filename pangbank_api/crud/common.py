@@ -8,6 +8,11 @@ class PaginationParams(BaseModel):
     limit: int = Field(default=20, le=100)
 
 
+class KeysetPaginationParams(PaginationParams):
+    # Return rows with an id greater than after_id, pages cost the same at any depth
+    after_id: int | None = None
+
+
 class FilterRelease(BaseModel):
     only_latest_release: bool | None = None
 
@@ -1,9 +1,13 @@
-from sqlalchemy import func
+from typing import TypeVar
+
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from pangbank_api.crud.common import (
     FilterGenomeTaxon,
-    PaginationParams,
+    KeysetPaginationParams,
     get_taxonomies_from_taxa,
 )
 from pangbank_api.models import (
@@ -15,6 +19,16 @@ from pangbank_api.models import (
     GenomeSourcePublic,
 )
 
+T = TypeVar("T")
+
+# Relationships read by get_genome_public. A single genome has few taxa, so they
+# are joined into the genome query. List queries use selectinload instead, so the
+# genome rows are not repeated once per taxon.
+GENOME_PUBLIC_JOINED_LOADS = (
+    joinedload(Genome.taxa).joinedload(Taxon.taxonomy_source),  # type: ignore
+    joinedload(Genome.genome_source),  # type: ignore
+)
+
 
 def get_genome_public(genome: Genome) -> GenomePublicWithTaxonomies:
     taxonomies = get_taxonomies_from_taxa(genome.taxa)
@@ -29,7 +43,7 @@ def get_genome_public(genome: Genome) -> GenomePublicWithTaxonomies:
 def get_genome_by_id(
     session: Session, genome_id: int
 ) -> GenomePublicWithTaxonomies | None:
-    genome = session.get(Genome, genome_id)
+    genome = session.get(Genome, genome_id, options=GENOME_PUBLIC_JOINED_LOADS)
     if genome is None:
         return None
 
@@ -39,7 +53,11 @@ def get_genome_by_id(
 def get_genome_by_name(
     session: Session, genome_name: str
 ) -> GenomePublicWithTaxonomies | None:
-    genome = session.exec(select(Genome).where(Genome.name == genome_name)).first()
+    genome = session.exec(
+        select(Genome)
+        .where(Genome.name == genome_name)
+        .options(*GENOME_PUBLIC_JOINED_LOADS)
+    ).first()
 
     if genome is None:
         return None
@@ -47,19 +65,13 @@ def get_genome_by_name(
     return get_genome_public(genome)
 
 
-def get_genomes(
-    session: Session,
-    filter_params: FilterGenomeTaxon,
-    pagination_params: PaginationParams | None,
-) -> list[GenomePublicWithTaxonomies]:
-    query = select(Genome).distinct()
-
+def filter_genomes(
+    query: SelectOfScalar[T], filter_params: FilterGenomeTaxon
+) -> SelectOfScalar[T]:
     if filter_params.genome_name is not None:
         query = query.where(Genome.name == filter_params.genome_name)
 
     if filter_params.taxon_name is not None:
-        # Apply offset and limit
-
         query = query.join(GenomeTaxonLink).join(Taxon)
 
         if filter_params.substring_taxon_match:
@@ -70,8 +82,42 @@ def get_genomes(
             # exact match
             query = query.where(Taxon.name == filter_params.taxon_name)
 
+    return query
+
+
+def count_genomes(session: Session, filter_params: FilterGenomeTaxon) -> int:
+    # Count in the database instead of loading and serialising the genomes
+    query = select(func.count(distinct(Genome.id))).select_from(Genome)
+
+    return session.exec(filter_genomes(query, filter_params)).one()
+
+
+def get_genomes(
+    session: Session,
+    filter_params: FilterGenomeTaxon,
+    pagination_params: KeysetPaginationParams | None,
+) -> list[GenomePublicWithTaxonomies]:
+    # Taxa, their taxonomy sources and the genome source are read by
+    # get_genome_public: load them with one query per relationship
+    query = (
+        select(Genome)
+        .distinct()
+        .options(
+            selectinload(Genome.taxa).selectinload(Taxon.taxonomy_source),  # type: ignore
+            selectinload(Genome.genome_source),  # type: ignore
+        )
+    )
+
+    query = filter_genomes(query, filter_params)
+
     if pagination_params:
-        query = query.offset(pagination_params.offset).limit(pagination_params.limit)
+        if pagination_params.after_id is not None:
+            query = query.where(Genome.id > pagination_params.after_id)  # type: ignore
+        query = (
+            query.order_by(Genome.id)  # type: ignore
+            .offset(pagination_params.offset)
+            .limit(pagination_params.limit)
+        )
 
     db_genomes = session.exec(query).all()
 
@@ -3,9 +3,10 @@ from typing import Iterator, Sequence
 
 from sqlalchemy import func
 
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, selectinload
 
 from sqlmodel import Session, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from pangbank_api.crud.common import (
     FilterGenomeTaxonGenomePangenome,
@@ -98,11 +99,10 @@ def get_public_pangenome(session: Session, pangenome_id: int) -> PangenomePublic
     return make_pangenome_public(pangenome)
 
 
-def get_pangenomes(
-    session: Session,
+def select_pangenomes(
     filter_params: FilterGenomeTaxonGenomePangenome | None = None,
     pagination_params: PaginationParams | None = None,
-) -> Sequence[Pangenome]:
+) -> SelectOfScalar[Pangenome]:
 
     query = select(Pangenome).distinct()
 
@@ -153,7 +153,16 @@ def get_pangenomes(
     if pagination_params:
         query = query.offset(pagination_params.offset).limit(pagination_params.limit)
 
-    pangenomes = session.exec(query).all()
+    return query
+
+
+def get_pangenomes(
+    session: Session,
+    filter_params: FilterGenomeTaxonGenomePangenome | None = None,
+    pagination_params: PaginationParams | None = None,
+) -> Sequence[Pangenome]:
+
+    pangenomes = session.exec(select_pangenomes(filter_params, pagination_params)).all()
 
     return pangenomes
 
@@ -164,7 +173,16 @@ def get_public_pangenomes(
     pagination_params: PaginationParams | None = None,
 ) -> Iterator[PangenomePublic]:
 
-    pangenomes = get_pangenomes(session, filter_params, pagination_params)
+    # Load everything make_pangenome_public reads with one query per relationship
+    # instead of lazy loading it pangenome by pangenome
+    query = select_pangenomes(filter_params, pagination_params).options(
+        selectinload(Pangenome.taxa).selectinload(Taxon.taxonomy_source),  # type: ignore
+        selectinload(Pangenome.collection_release).options(  # type: ignore
+            selectinload(CollectionRelease.taxonomy_source),  # type: ignore
+            selectinload(CollectionRelease.collection),  # type: ignore
+        ),
+    )
+    pangenomes = session.exec(query).all()
 
     public_pangenomes = (make_pangenome_public(pangenome) for pangenome in pangenomes)
 
@@ -198,18 +198,21 @@ def parse_genome_metrics_file(tsv_file_path: Path) -> Iterator[GenomeInPangenome
     open_func = gzip.open if tsv_file_path.suffix == ".gz" else open
 
     with open_func(tsv_file_path, mode="rt", newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(filter(lambda row: row[0] != "#", file), delimiter="\t")
+        lines = (line for line in file if not line.startswith("#"))
+        reader = csv.DictReader(lines, delimiter="\t")
+
+        # Lowercase the header once rather than every key of every row
+        if reader.fieldnames is not None:
+            reader.fieldnames = [name.lower() for name in reader.fieldnames]
 
         for row in reader:
             try:
-                genome_data = GenomeInPangenomeMetric.model_validate(
-                    {key.lower(): value for key, value in row.items()}
-                )
-                yield genome_data
-
+                genome_data = GenomeInPangenomeMetric.model_validate(row)
             except ValueError as e:
                 raise ValueError(f"Error parsing row {row}: {e}") from e
 
+            yield genome_data
+
 
 def get_pangenome_metrics_from_genome_stats_summary_yaml(
     yaml_genome_stats_summary_path: Path,
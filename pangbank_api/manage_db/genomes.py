@@ -2,7 +2,7 @@ import gzip
 import logging
 from typing import List
 
-from rich.progress import track
+from sqlalchemy import insert
 from sqlmodel import Session, select
 
 from pangbank_api.models import Genome, GenomeSource
@@ -26,44 +26,50 @@ def create_genomes(
     genome_name_to_genomes: dict[str, Genome] = {}
 
     for genome_source in genome_sources:
-        new_genomes: list[Genome] = []
+        genome_names = source_to_genomes[genome_source.name]
 
-        name_to_existing_genome = {
-            genome.name: genome
-            for genome in session.exec(
-                select(Genome).where(Genome.genome_source == genome_source)
+        existing_genome_names = set(
+            session.exec(
+                select(Genome.name).where(Genome.genome_source_id == genome_source.id)
             ).all()
-        }
+        )
         logging.info(
-            f"Found {len(name_to_existing_genome)} genomes from '{genome_source.name}' in the database."
+            f"Found {len(existing_genome_names)} genomes from '{genome_source.name}' in the database."
         )
 
-        for genome_name in track(
-            source_to_genomes[genome_source.name],
-            description=f"Processing genomes from {genome_source.name}",
-        ):
-            if genome_name in name_to_existing_genome:
-                genome = name_to_existing_genome[genome_name]
-            else:
-                genome = Genome(name=genome_name)
-                new_genomes.append(genome)
-
-            genome_name_to_genomes[genome_name] = genome
-
-        if new_genomes:
-            logging.info(f"Adding {len(new_genomes)} new genomes to the database.")
-            session.add_all(new_genomes)
-
-            for new_genome in new_genomes:
-                new_genome.genome_source = genome_source
-
+        new_genome_names = [
+            genome_name
+            for genome_name in genome_names
+            if genome_name not in existing_genome_names
+        ]
+
+        if new_genome_names:
+            logging.info(f"Adding {len(new_genome_names)} new genomes to the database.")
+            # Bulk insert: new genomes are loaded back below with their ids
+            session.execute(
+                insert(Genome),
+                [
+                    {"name": genome_name, "genome_source_id": genome_source.id}
+                    for genome_name in new_genome_names
+                ],
+            )
         else:
             logging.info(
                 "No new genomes to add. All provided genomes are already present in the database."
             )
-        session.refresh(genome_source)
         session.commit()
 
+        genome_names_of_source = set(genome_names)
+        genome_name_to_genomes.update(
+            {
+                genome.name: genome
+                for genome in session.exec(
+                    select(Genome).where(Genome.genome_source_id == genome_source.id)
+                ).all()
+                if genome.name in genome_names_of_source
+            }
+        )
+
     return genome_name_to_genomes
 
 
@@ -83,7 +89,9 @@ def parse_genome_to_source_files(
         open_func = gzip.open if genome_source_input.file.suffix == ".gz" else open
 
         with open_func(genome_source_input.file, "rt") as fl:
-            source_to_genomes[genome_source_input.name] = [line.strip() for line in fl]
+            source_to_genomes[genome_source_input.name] = [
+                genome_name for line in fl if (genome_name := line.strip())
+            ]
 
     return source_to_genomes
 
@@ -1,5 +1,6 @@
 import gzip
 import logging
+import re
 from pathlib import Path
 
 import typer
@@ -17,6 +18,9 @@ from pangbank_api.manage_db.input_models import TaxonomySourceInput
 
 app = typer.Typer(no_args_is_help=True)
 
+# Splits a lineage on ';' and trims the whitespace around each taxon name
+LINEAGE_SEPARATOR = re.compile(r"\s*;\s*")
+
 
 def parse_taxonomy_file(taxonomy_file: Path) -> dict[str, tuple[str, ...]]:
     genome_to_lineage: dict[str, tuple[str, ...]] = {}
@@ -27,7 +31,7 @@ def parse_taxonomy_file(taxonomy_file: Path) -> dict[str, tuple[str, ...]]:
         for line in fl:
             genome_name, taxonomy_str = line.strip().split("\t")
             genome_to_lineage[genome_name] = tuple(
-                name.strip() for name in taxonomy_str.split(";")
+                LINEAGE_SEPARATOR.split(taxonomy_str.strip())
             )
 
     return genome_to_lineage
@@ -82,13 +86,22 @@ def create_taxonomy_source(
     return taxonomy_source
 
 
+def taxon_key(taxon: Taxon) -> tuple[int | None, str, str, int, int | None, int | None]:
+    return (
+        taxon.id,
+        taxon.name,
+        taxon.rank,
+        taxon.depth,
+        taxon.taxid,
+        taxon.taxonomy_source_id,
+    )
+
+
 def get_common_taxa(taxa_A: list[Taxon], taxa_B: list[Taxon]) -> list[Taxon]:
-    common_taxa: list[Taxon] = []
-    for taxon in taxa_A:
-        if taxon in taxa_B:
-            common_taxa.append(taxon)
+    # Hash the taxa of B once so each lookup is constant time instead of a list scan
+    taxa_B_keys = {taxon_key(taxon) for taxon in taxa_B}
 
-    return common_taxa
+    return [taxon for taxon in taxa_A if taxon_key(taxon) in taxa_B_keys]
 
 
 def get_taxa_by_depth(depth: int, taxonomy_source: TaxonomySource, session: Session):
@@ -19,8 +19,7 @@ def check_and_read_json_file(input_json_file: Path):
         raise typer.Exit(1)
 
     try:
-        with open(input_json_file) as fl:
-            json_content = json.load(fl)
+        json_content = json.loads(input_json_file.read_bytes())
 
     except json.JSONDecodeError as e:
         typer.echo(f"[bold red]Error:[/bold red] Invalid JSON format: {e}", err=True)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from pangbank_api.crud import genomes as genomes_crud
-from pangbank_api.crud.common import FilterGenomeTaxon, PaginationParams
+from pangbank_api.crud.common import FilterGenomeTaxon, KeysetPaginationParams
 from pangbank_api.dependencies import SessionDep
 from pangbank_api.models import GenomePublicWithTaxonomies
 
@@ -15,13 +15,20 @@ router = APIRouter(
 async def read_genomes(
     session: SessionDep,
     filter_params: FilterGenomeTaxon = Depends(),
-    pagination_params: PaginationParams = Depends(),
+    pagination_params: KeysetPaginationParams = Depends(),
 ):
     genomes = genomes_crud.get_genomes(session, filter_params, pagination_params)
 
     return genomes
 
 
+@router.get("/genomes/count/", response_model=int)
+async def get_genome_count(
+    session: SessionDep, filter_params: FilterGenomeTaxon = Depends()
+):
+    return genomes_crud.count_genomes(session, filter_params)
+
+
 @router.get("/genomes/{genome_id}", response_model=GenomePublicWithTaxonomies)
 async def get_genome_by_id(genome_id: int, session: SessionDep):
     # genome = session.get(Genome, genome_id)
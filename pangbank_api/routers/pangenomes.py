@@ -18,6 +18,10 @@ router = APIRouter(
 )
 
 
+def file_exists(path: Path) -> bool:
+    return path.exists()
+
+
 @router.get("/pangenomes/", response_model=list[PangenomePublic])
 async def get_pangenomes(
     session: SessionDep,
@@ -56,7 +60,7 @@ async def get_pangenome_file(
     )
 
     pangenome_full_path = settings.pangbank_data_dir / pangenome_relative_path
-    if not pangenome_full_path.exists():
+    if not file_exists(pangenome_full_path):
         raise HTTPException(
             status_code=404,
             detail=f"Pangenome file {pangenome_relative_path} does not exists",
@@ -149,7 +153,7 @@ async def get_genome_cgview_map(
     cgview_map_full_path = settings.pangbank_data_dir / cgview_map_relative_path
     # cgview_map_relative_path
 
-    if not cgview_map_full_path.exists():
+    if not file_exists(cgview_map_full_path):
         raise HTTPException(
             status_code=404,
             detail=f"cgview map '{cgview_map_relative_path}' does not exist",
@@ -188,7 +192,7 @@ async def get_pangenome_dbg(
     )
     dbg_full_path = settings.pangbank_data_dir / dbg_relative_path
 
-    if not dbg_full_path.exists():
+    if not file_exists(dbg_full_path):
         raise HTTPException(
             status_code=404,
             detail=f"DBG file {dbg_relative_path} does not exists",
@@ -210,7 +214,7 @@ def get_annotation(pangenome_id: int, suffix: str, session: SessionDep, settings
     )
     dbg_annotations_full_path = settings.pangbank_data_dir / dbg_annotations_relative_path
 
-    if not dbg_annotations_full_path.exists():
+    if not file_exists(dbg_annotations_full_path):
         raise HTTPException(
             status_code=404,
             detail=f"DBG annotations file {dbg_annotations_relative_path} does not exists",
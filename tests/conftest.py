@@ -0,0 +1,9 @@
+from .mock_session import (
+    engine_fixture,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    connection_fixture,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    seed_session,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    session_fixture,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    query_counter,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    app_client,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    client_fixture,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+)
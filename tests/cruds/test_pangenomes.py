@@ -3,15 +3,17 @@ from sqlmodel import Session
 from pangbank_api.crud.common import FilterGenomeTaxonGenomePangenome, PaginationParams
 from pangbank_api.crud.pangenomes import get_pangenomes
 from pangbank_api.models import Pangenome
-from ..mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
 from ..mock_data import (
     mock_data,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    reference_taxa,  # type: ignore # noqa: F401 # pylint: disable=unused-import
     pangenome_metric_data,  # type: ignore # noqa: F401 # pylint: disable=unused-import
     genome_in_pangenome_metric_data,  # type: ignore # noqa: F401 # pylint: disable=unused-import
 )
 
 
-def test_get_pangenomes_no_filters(session: Session, mock_data: None):
+def test_get_pangenomes_no_filters(
+    session: Session, mock_data: None, query_counter: list[str]
+):
     """Test with no filters applied, should return all pangenomes."""
     empty_filter_params = FilterGenomeTaxonGenomePangenome()
 
@@ -19,19 +21,25 @@ def test_get_pangenomes_no_filters(session: Session, mock_data: None):
         session=session, filter_params=empty_filter_params, pagination_params=None
     )
     assert len(result) == 3  # Expecting all 3 pangenomes
+    assert len(query_counter) == 1  # A single SELECT, no lazy loading
     assert all(isinstance(p, Pangenome) for p in result)
 
 
-def test_get_pangenomes_with_genome_name_filter(session: Session, mock_data: None):
+def test_get_pangenomes_with_genome_name_filter(
+    session: Session, mock_data: None, query_counter: list[str]
+):
     """Test with genome_name filter."""
     filter_params = FilterGenomeTaxonGenomePangenome(genome_name="GenomeA")
 
     result = get_pangenomes(session=session, filter_params=filter_params)
 
     assert len(result) == 2
+    assert len(query_counter) == 1
 
 
-def test_get_pangenomes_with_taxon_name_filter(session: Session, mock_data: None):
+def test_get_pangenomes_with_taxon_name_filter(
+    session: Session, mock_data: None, query_counter: list[str]
+):
     """Test with exact taxon_name filter."""
 
     filter_params = FilterGenomeTaxonGenomePangenome(taxon_name="d__Bacteria")
@@ -39,10 +47,11 @@ def test_get_pangenomes_with_taxon_name_filter(session: Session, mock_data: None
         session=session, filter_params=filter_params, pagination_params=None
     )
     assert len(result) == 1
+    assert len(query_counter) == 1
 
 
 def test_get_pangenomes_with_taxon_name_substring_filter(
-    session: Session, mock_data: None
+    session: Session, mock_data: None, query_counter: list[str]
 ):
     """Test with taxon_name substring filter."""
 
@@ -54,9 +63,12 @@ def test_get_pangenomes_with_taxon_name_substring_filter(
     )
 
     assert len(result) == 2  # Should match only the taxon that contains "Bact"
+    assert len(query_counter) == 1
 
 
-def test_get_pangenomes_with_pagination(session: Session, mock_data: None):
+def test_get_pangenomes_with_pagination(
+    session: Session, mock_data: None, query_counter: list[str]
+):
     """Test with pagination (offset and limit)."""
     pagination_params = PaginationParams(offset=0, limit=1)
     empty_filter_params = FilterGenomeTaxonGenomePangenome()
@@ -67,9 +79,12 @@ def test_get_pangenomes_with_pagination(session: Session, mock_data: None):
         pagination_params=pagination_params,
     )
     assert len(result) == 1  # With pagination, only one result should be returned
+    assert len(query_counter) == 1
 
 
-def test_get_pangenomes_with_combined_filters(session: Session, mock_data: None):
+def test_get_pangenomes_with_combined_filters(
+    session: Session, mock_data: None, query_counter: list[str]
+):
     """Test with multiple filters applied."""
 
     filter_params = FilterGenomeTaxonGenomePangenome(
@@ -78,10 +93,11 @@ def test_get_pangenomes_with_combined_filters(session: Session, mock_data: None)
 
     result = get_pangenomes(session=session, filter_params=filter_params)
     assert len(result) == 1  # Only one result should match the combined filters
+    assert len(query_counter) == 1
     assert result[0].collection_release.latest is True
 
 
-def test_get_pangenomes_no_results(session: Session):
+def test_get_pangenomes_no_results(session: Session, query_counter: list[str]):
     """Test when no results match the filters."""
 
     filter_params = FilterGenomeTaxonGenomePangenome(genome_name="NoValidGenomeName")
@@ -90,3 +106,4 @@ def test_get_pangenomes_no_results(session: Session):
         session=session, filter_params=filter_params, pagination_params=None
     )
     assert len(result) == 0  # Should return no
+    assert len(query_counter) == 1
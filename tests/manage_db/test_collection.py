@@ -21,7 +21,6 @@ from sqlmodel import Session, select
 from unittest.mock import patch
 
 import gzip
-from ..mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
 
 
 @pytest.fixture()
@@ -71,13 +70,15 @@ def collection():
     return collection
 
 
-@pytest.fixture()
-def pangenome_dir(tmp_path: Path):
-    """Creates a mock pangenome directory with necessary files."""
+@pytest.fixture(scope="session")
+def pangenome_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Creates a mock pangenome directory with necessary files.
+
+    The directory is only read by the tests, so it is written once per session.
+    """
 
     # Create main pangenome directory
-    main_pangenome_dir = tmp_path / "pangenomes"
-    main_pangenome_dir.mkdir(parents=True, exist_ok=True)
+    main_pangenome_dir = tmp_path_factory.mktemp("pangenomes")
 
     # Create species-specific directory
     pangenome_dir = main_pangenome_dir / "speciesA"
@@ -162,7 +163,7 @@ GenomeA\tgenomic.gbff.gz\t3e8884a3ecbd47ab0573ba68257dcdb0
 GenomeB\tgenomic.gbff.gz\td0365cda22933ded5864dddfd2aed96f
 """
     genomes_md5sum = pangenome_dir / "genomes_md5sum.tsv.gz"
-    with gzip.open(genomes_md5sum, "wt", encoding="utf-8") as f:
+    with gzip.open(genomes_md5sum, "wt", compresslevel=1, encoding="utf-8") as f:
         f.write(genomes_md5sum_content)
 
     # Create and write to `genomes_statistics.tsv.gz`
@@ -174,7 +175,7 @@ GenomeA	1	813	4	811	2	2	766	768	766	768	785	4	783	2	2	26	0	26	0	0	2	0	2	0	0	99.8
 GenomeB	1	811	2	810	1	1	766	767	766	767	784	2	783	1	1	27	0	27	0	0	0	0	0	0	0	99.87	0.13	0.12	1	0	0
 """
     genomes_statistics = pangenome_dir / "genomes_statistics.tsv.gz"
-    with gzip.open(genomes_statistics, "wt") as f:
+    with gzip.open(genomes_statistics, "wt", compresslevel=1) as f:
         f.write(genomes_statistics_content)
 
     return pangenome_dir
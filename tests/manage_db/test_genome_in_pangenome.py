@@ -1,22 +1,23 @@
-from typing import Any, Dict
+from typing import Any, Mapping
+
+import pytest
+from sqlmodel import Session, select
+
 from pangbank_api.models import (
     Genome,
     GenomePangenomeLink,
     Pangenome,
 )
-
-import pytest
-from sqlmodel import Session, select
-from ..mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
 from ..mock_data import (
     mock_data,  # type: ignore # noqa: F401 # pylint: disable=unused-import
+    reference_taxa,  # type: ignore # noqa: F401 # pylint: disable=unused-import
     pangenome_metric_data,  # type: ignore # noqa: F401 # pylint: disable=unused-import
     genome_in_pangenome_metric_data,  # type: ignore # noqa: F401 # pylint: disable=unused-import
 )
 
 
 def test_genome_in_pangenome_uniqness(
-    session: Session, mock_data: None, genome_in_pangenome_metric_data: Dict[str, Any]
+    session: Session, mock_data: None, genome_in_pangenome_metric_data: Mapping[str, Any]
 ):
     """Test with no filters applied, should return all pangenomes."""
 
@@ -37,12 +38,12 @@ def test_genome_in_pangenome_uniqness(
 
     session.add(genome)
     session.add(genome_pangenome_link)
-    session.commit()
+    session.flush()
 
     session.refresh(genome)
 
     genome_pangenome_link = session.exec(
-        select(GenomePangenomeLink).join(Genome).where(Genome.name == "GenomeX")
+        select(GenomePangenomeLink).where(GenomePangenomeLink.genome_id == genome.id)
     ).one()
 
     assert genome_pangenome_link is not None
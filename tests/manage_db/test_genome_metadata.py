@@ -2,52 +2,92 @@ from pangbank_api.manage_db.genome_metadata import add, delete, list
 from pangbank_api.models import Genome, GenomeMetadata, GenomeMetadataSource
 
 import pytest
-import tempfile
-import json
 import random
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import DEFAULT, MagicMock, patch
+from sqlalchemy import insert
 from sqlmodel import Session, select
 
-from ..mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
+from ..mock_data import dumps_json
 
 
-@pytest.fixture
-def metadata_source_file():
+# Statements reused across tests are built once at import time
+SELECT_GENOMES = select(Genome)
+SELECT_METADATA = select(GenomeMetadata)
+SELECT_METADATA_SOURCES = select(GenomeMetadataSource)
+
+
+@pytest.fixture(scope="session")
+def metadata_source_file(tmp_path_factory: pytest.TempPathFactory) -> str:
     """Creates a temporary JSON metadata file for testing."""
     metadata = {"name": "DB_A", "version": "2.6.0"}
 
-    with tempfile.NamedTemporaryFile(
-        mode="w", delete=False, suffix=".json"
-    ) as json_file:
-        json.dump(metadata, json_file)
-        json_file_path = json_file.name
+    json_file = tmp_path_factory.mktemp("metadata") / "metadata_source.json"
+    json_file.write_bytes(dumps_json(metadata))
 
-    yield json_file_path
+    return str(json_file)
 
 
-@pytest.fixture
-def metadata_file():
+@pytest.fixture(scope="session")
+def metadata_file(tmp_path_factory: pytest.TempPathFactory) -> str:
     """Creates a temporary TSV metadata file for testing."""
+    rng = random.Random(0)
     header = "genomes\tFeature1\tFeature2\n"
     rows = [
-        f"Genome_{i}\t{round(random.uniform(1, 10), 2)}\t{round(random.uniform(10, 20), 2)}\n"
+        f"Genome_{i}\t{rng.uniform(1, 10):.2f}\t{rng.uniform(10, 20):.2f}\n"
         for i in range(1, 6)
     ]
 
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".tsv") as tsv_file:
-        tsv_file.write(header)
-        tsv_file.writelines(rows)
-        tsv_file_path = tsv_file.name
+    tsv_file = tmp_path_factory.mktemp("metadata") / "metadata.tsv"
+    tsv_file.write_text(header + "".join(rows))
+
+    return str(tsv_file)
+
+
+def test_add_genome_metadata(
+    session: Session, metadata_source_file: str, metadata_file: str
+):
+    # Fixture rows need no identity tracking: one executemany INSERT
+    session.execute(insert(Genome), [{"name": f"Genome_{i}"} for i in range(1, 6)])
+    session.commit()
 
-    yield tsv_file_path
+    source_path = Path(metadata_source_file)
+    metadata_path = Path(metadata_file)
+
+    with patch.multiple(
+        "pangbank_api.manage_db.genome_metadata",
+        Session=MagicMock(return_value=session),
+        create_db_and_tables=DEFAULT,
+        # None of the genomes belong to a pangenome, so return them all
+        get_all_genomes_in_pangenome=MagicMock(
+            side_effect=lambda session: session.exec(SELECT_GENOMES).all()
+        ),
+    ):
+        add(source_path, metadata_path)
+
+        metadata_sources = session.exec(SELECT_METADATA_SOURCES).all()
+        assert len(metadata_sources) == 1
+        assert metadata_sources[0].name == "DB_A"
+
+        metadata = session.exec(SELECT_METADATA).all()
+        assert len(metadata) == 10  # 5 genomes x 2 features
+        assert {m.key for m in metadata} == {"Feature1", "Feature2"}
+
+        # Adding metadata again from the same source does not duplicate the source
+        add(source_path, metadata_path)
+
+        metadata_sources = session.exec(SELECT_METADATA_SOURCES).all()
+        assert len(metadata_sources) == 1
 
 
 def test_delete_unexisiting_genome_metadata(session: Session):
-    with patch("pangbank_api.manage_db.genome_metadata.Session", return_value=session):
-        with patch("pangbank_api.manage_db.genome_metadata.create_db_and_tables"):
-            with pytest.raises(ValueError):
-                delete("UNEXISTING_SOURCE")
+    with patch.multiple(
+        "pangbank_api.manage_db.genome_metadata",
+        Session=MagicMock(return_value=session),
+        create_db_and_tables=DEFAULT,
+    ):
+        with pytest.raises(ValueError):
+            delete("UNEXISTING_SOURCE")
 
 
 def test_list_metadata_source(
@@ -8,9 +8,6 @@ from pangbank_api.models import Genome
 from pangbank_api.manage_db.input_models import GenomeSourceInput
 
 
-from ..mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
-
-
 @pytest.fixture
 def genome_source_info(tmp_path: Path):
     genome_source_file = tmp_path / "RefSeq.list"
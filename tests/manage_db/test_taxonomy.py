@@ -1,5 +1,6 @@
 import pytest
 import gzip
+from itertools import chain
 from pathlib import Path
 from pangbank_api.manage_db.taxonomy import (
     parse_taxonomy_file,
@@ -12,9 +13,6 @@ from pangbank_api.models import TaxonomySource, Taxon, Genome
 from sqlmodel import Session, select
 
 
-from ..mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
-
-
 @pytest.fixture
 def taxonomy_tsv(tmp_path: Path):
     """Creates a valid uncompressed taxonomy file."""
@@ -30,7 +28,7 @@ def taxonomy_tsv(tmp_path: Path):
 def taxonomy_tsv_gz(tmp_path: Path):
     """Creates a valid gzipped taxonomy file."""
     file = tmp_path / "taxonomy.tsv.gz"
-    with gzip.open(file, "wt") as f:
+    with gzip.open(file, "wt", compresslevel=1) as f:
         f.write(
             "genome1\tDomain;Phylum;Class;Order;Family;Genus;Species\n"
             "genome2\tDomain;Phylum;Class;Order;Family;Genus;Species\n"
@@ -127,17 +125,17 @@ def test_link_genomes_and_taxa(session: Session):
             "S1b": Taxon(name="S1b", rank="Species", depth=2),
         },
     ]
-    taxa = [taxon for depth in name_to_taxon_by_depth for taxon in depth.values()]
+    taxa = list(
+        chain.from_iterable(
+            name_to_taxon.values() for name_to_taxon in name_to_taxon_by_depth
+        )
+    )
     session.add_all(taxa)
     session.add_all([genome_a, genome_b])
 
+    # commit() expires every instance, their ids are loaded on first access
     session.commit()
 
-    session.refresh(genome_a)
-    session.refresh(genome_b)
-    for taxon in taxa:
-        session.refresh(taxon)
-
     link_genomes_and_taxa(
         genome_name_to_genome=genome_name_to_genome,
         genome_name_to_lineage=genome_name_to_lineage,
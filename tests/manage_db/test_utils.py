@@ -1,10 +1,11 @@
 from typing import Any, Dict
 import pytest
-import json
 from pathlib import Path
 import typer
 from pangbank_api.manage_db.utils import parse_collection_release_input_json
 
+from ..mock_data import dumps_json
+
 
 @pytest.fixture
 def temp_json_file(tmp_path: Path):
@@ -54,7 +55,7 @@ def temp_json_file(tmp_path: Path):
     taxonomy_file.touch()
     mash_sketch_file.touch()
 
-    json_file.write_text(json.dumps(json_data))
+    json_file.write_bytes(dumps_json(json_data))
     return json_file
 
 
@@ -1,25 +1,28 @@
 import datetime
-from typing import Any, Dict
+import json
+from types import MappingProxyType
+from typing import Any, Mapping
 
 import pytest
-from sqlmodel import Session
+from sqlalchemy import Connection, insert
+from sqlmodel import Session, SQLModel
 
 from pangbank_api.models import (
     Genome,
+    GenomeInPangenomeMetric,
     GenomePangenomeLink,
     Pangenome,
+    PangenomeTaxonLink,
     Taxon,
     TaxonomySource,
     Collection,
     CollectionRelease,
 )
-from .mock_session import session_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
 
 
-@pytest.fixture
-def pangenome_metric_data(session: Session) -> Dict[str, Any]:
-    # Sample data as dictionaries
-    metric1: Dict[str, Any] = {
+# Static sample data, read-only so a test cannot leak a mutation into another one
+PANGENOME_METRIC_DATA: Mapping[str, Any] = MappingProxyType(
+    {
         "gene_count": 1000,
         "genome_count": 50,
         "family_count": 200,
@@ -53,17 +56,10 @@ def pangenome_metric_data(session: Session) -> Dict[str, Any]:
         "mean_shell_families_count_per_genome": 40.0,
         "mean_cloud_families_count_per_genome": 40.0,
     }
+)
 
-    # Return as list of dicts
-    return metric1  # [metric1, metric2]
-
-
-# @pytest.fixture(name="genome_in_pangenome_metric_data")
-
-
-@pytest.fixture()
-def genome_in_pangenome_metric_data() -> Dict[str, Any]:
-    return {
+GENOME_IN_PANGENOME_METRIC_DATA: Mapping[str, Any] = MappingProxyType(
+    {
         "Genome_name": "GenomeA",
         "Contigs": 50,
         "Genes": 1000,
@@ -97,117 +93,170 @@ def genome_in_pangenome_metric_data() -> Dict[str, Any]:
         "Spots": 5,
         "Modules": 8,
     }
+)
 
 
-@pytest.fixture
-def mock_data(
-    session: Session,
-    pangenome_metric_data: Dict[str, Any],
-    genome_in_pangenome_metric_data: Dict[str, Any],
-):
-    # Create mock Pangenome and related models for the test
-    collection = Collection(name="Collection 1", description="Test Collection")
-    release1 = CollectionRelease(
-        version="1.0.0",
-        ppanggolin_version="2.3.4",
-        pangbank_wf_version="1.2.3",
-        pangenomes_directory="/path/to/pangenomes",
-        release_note="Initial release.",
-        mash_sketch="sketch/path",
-        mash_version="2.0",
-        date=datetime.datetime.now(),
-        collection=collection,
-        mash_sketch_md5sum="1234567890abcdef",
-    )
-    release2 = CollectionRelease(
-        version="2.0.0",
-        ppanggolin_version="2.3.4",
-        pangbank_wf_version="1.2.3",
-        pangenomes_directory="/path/to/pangenomes",
-        release_note="Initial release.",
-        mash_sketch="sketch/path",
-        mash_version="2.0",
-        date=datetime.datetime.now(),
-        collection=collection,
-        latest=True,
-        mash_sketch_md5sum="1234567890abcdef",
-    )
+@pytest.fixture(scope="module")
+def pangenome_metric_data() -> Mapping[str, Any]:
+    return PANGENOME_METRIC_DATA
 
-    taxonomy_source = TaxonomySource(name="TaxSouce", ranks="Domain;Family;Species")
 
-    taxon_bact = Taxon(
-        name="d__Bacteria", rank="Domain", depth=0, taxonomy_source=taxonomy_source
-    )
-    taxon_actino = Taxon(
-        name="p__Actinobacteria",
-        rank="Phylum",
-        depth=1,
-        taxonomy_source=taxonomy_source,
-    )
-    taxon_archaea = Taxon(
-        name="d__Archaea", rank="Domain", depth=0, taxonomy_source=taxonomy_source
-    )
+@pytest.fixture(scope="module")
+def genome_in_pangenome_metric_data() -> Mapping[str, Any]:
+    return GENOME_IN_PANGENOME_METRIC_DATA
 
-    taxonomy_source2 = TaxonomySource(name="TaxSouce", ranks="Domain;Family;Species")
 
-    taxon_bact_2 = Taxon(
-        name="Bacteria", rank="Domain", depth=0, taxonomy_source=taxonomy_source2
-    )
+def insert_rows(
+    session: Connection | Session,
+    model: type[SQLModel],
+    key: str,
+    rows: list[dict[str, Any]],
+) -> dict[Any, int]:
+    """Insert rows with a single executemany and map each row's key to its new id."""
+    key_column = getattr(model, key)
+    id_column = getattr(model, "id")
+    result = session.execute(insert(model).returning(key_column, id_column), rows)
+    return {row_key: row_id for row_key, row_id in result}
 
-    pangenome1 = Pangenome(
-        **pangenome_metric_data,
-        collection_release=release1,
-        file_name="Pangenome One",
-        name="Pangenome_One",
-        file_md5sum="1a",
-        taxa=[taxon_bact, taxon_actino],
-    )
-    pangenome2 = Pangenome(
-        **pangenome_metric_data,
-        collection_release=release1,
-        file_name="Pangenome Two",
-        name="Pangenome_Two",
-        file_md5sum="2a",
-        taxa=[taxon_archaea],
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialise data written to JSON fixture files."""
+    try:
+        from orjson import dumps
+    except ImportError:  # orjson is optional, fall back on the standard library
+        return json.dumps(obj).encode()
+
+    return dumps(obj)
+
+
+@pytest.fixture(scope="module")
+def reference_taxa(connection: Connection) -> dict[str, int]:
+    """Taxonomy source and taxa seeded once per module, before any test savepoint."""
+    taxonomy_source_ids = insert_rows(
+        connection,
+        TaxonomySource,
+        "name",
+        [{"name": "TaxSouce", "ranks": "Domain;Family;Species"}],
     )
-    pangenome3 = Pangenome(
-        **pangenome_metric_data,
-        collection_release=release2,
-        file_name="Pangenome Three",
-        name="Pangenome_Three",
-        file_md5sum="3a",
-        taxa=[taxon_bact_2],
+    return insert_rows(
+        connection,
+        Taxon,
+        "name",
+        [
+            {
+                "name": name,
+                "rank": rank,
+                "depth": depth,
+                "taxonomy_source_id": taxonomy_source_ids["TaxSouce"],
+            }
+            for name, rank, depth in [
+                ("d__Bacteria", "Domain", 0),
+                ("p__Actinobacteria", "Phylum", 1),
+                ("d__Archaea", "Domain", 0),
+                ("Bacteria", "Domain", 0),
+            ]
+        ],
     )
 
-    genomeA = Genome(name="GenomeA")
 
-    genome_pangenome_link = GenomePangenomeLink(
-        **genome_in_pangenome_metric_data,
-        genome=genomeA,
-        pangenome=pangenome1,
-        genome_file_md5sum="a6c41b3f5b5faff3cd98d1566a79cdb2",
-        genome_file_name="genomeA.fasta",
+@pytest.fixture
+def mock_data(
+    session: Session,
+    reference_taxa: dict[str, int],
+    pangenome_metric_data: Mapping[str, Any],
+    genome_in_pangenome_metric_data: Mapping[str, Any],
+):
+    # Create mock Pangenome and related models for the test. Rows go through
+    # Core inserts, the tests only query them back from the database.
+    collection_ids = insert_rows(
+        session,
+        Collection,
+        "name",
+        [{"name": "Collection 1", "description": "Test Collection"}],
+    )
+    release_fields: dict[str, Any] = {
+        "ppanggolin_version": "2.3.4",
+        "pangbank_wf_version": "1.2.3",
+        "pangenomes_directory": "/path/to/pangenomes",
+        "release_note": "Initial release.",
+        "mash_sketch": "sketch/path",
+        "mash_version": "2.0",
+        "date": datetime.datetime.now(),
+        "collection_id": collection_ids["Collection 1"],
+        "mash_sketch_md5sum": "1234567890abcdef",
+    }
+    release_ids = insert_rows(
+        session,
+        CollectionRelease,
+        "version",
+        [
+            {**release_fields, "version": "1.0.0", "latest": False},
+            {**release_fields, "version": "2.0.0", "latest": True},
+        ],
     )
 
-    genome_pangenome_link2 = GenomePangenomeLink(
-        **genome_in_pangenome_metric_data,
-        genome=genomeA,
-        pangenome=pangenome3,
-        genome_file_md5sum="a6c41b3f5b5faff3cd98d1566a79cdb2",
-        genome_file_name="genomeA.fasta",
+    pangenome_ids = insert_rows(
+        session,
+        Pangenome,
+        "name",
+        [
+            {
+                **pangenome_metric_data,
+                "collection_release_id": release_ids["1.0.0"],
+                "file_name": "Pangenome One",
+                "name": "Pangenome_One",
+                "file_md5sum": "1a",
+            },
+            {
+                **pangenome_metric_data,
+                "collection_release_id": release_ids["1.0.0"],
+                "file_name": "Pangenome Two",
+                "name": "Pangenome_Two",
+                "file_md5sum": "2a",
+            },
+            {
+                **pangenome_metric_data,
+                "collection_release_id": release_ids["2.0.0"],
+                "file_name": "Pangenome Three",
+                "name": "Pangenome_Three",
+                "file_md5sum": "3a",
+            },
+        ],
+    )
+    session.execute(
+        insert(PangenomeTaxonLink),
+        [
+            {
+                "pangenome_id": pangenome_ids[pangenome],
+                "taxon_id": reference_taxa[taxon],
+            }
+            for pangenome, taxon in [
+                ("Pangenome_One", "d__Bacteria"),
+                ("Pangenome_One", "p__Actinobacteria"),
+                ("Pangenome_Two", "d__Archaea"),
+                ("Pangenome_Three", "Bacteria"),
+            ]
+        ],
     )
 
-    session.add_all(
+    genome_ids = insert_rows(session, Genome, "name", [{"name": "GenomeA"}])
+
+    # The metric data is keyed by the TSV column aliases, not the column names
+    genome_metrics = GenomeInPangenomeMetric.model_validate(
+        genome_in_pangenome_metric_data
+    ).model_dump()
+    session.execute(
+        insert(GenomePangenomeLink),
         [
-            collection,
-            release1,
-            release2,
-            pangenome1,
-            pangenome2,
-            pangenome3,
-            genomeA,
-            genome_pangenome_link,
-            genome_pangenome_link2,
-        ]
+            {
+                **genome_metrics,
+                "genome_id": genome_ids["GenomeA"],
+                "pangenome_id": pangenome_ids[pangenome],
+                "genome_file_md5sum": "a6c41b3f5b5faff3cd98d1566a79cdb2",
+                "genome_file_name": "genomeA.fasta",
+            }
+            for pangenome in ["Pangenome_One", "Pangenome_Three"]
+        ],
     )
+
     session.commit()
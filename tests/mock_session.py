@@ -1,28 +1,123 @@
+from contextvars import ContextVar
+from typing import Any, Generator
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import Connection, Engine, event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from pangbank_api.dependencies import get_session
 from pangbank_api.main import app
 
+# Session handed to the app by the get_session override, set per test by client_fixture
+current_session: ContextVar[Session] = ContextVar("current_session")
 
-@pytest.fixture(name="session")
-def session_fixture():
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def set_test_sqlite_pragmas(dbapi_connection: Any, connection_record: Any):
+    """Skip durability bookkeeping on the test database. Never use in production."""
+    # pysqlite manages transactions itself and breaks SAVEPOINTs, leave it to SQLAlchemy
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def begin_sqlite_transaction(connection: Connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture() -> Engine:
+    """In-memory database whose schema is created once for the whole test session."""
     engine = create_engine(
-        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        query_cache_size=1200,
     )
+    event.listen(engine, "connect", set_test_sqlite_pragmas)
+    event.listen(engine, "begin", begin_sqlite_transaction)
     SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
+    return engine
 
 
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
+@pytest.fixture(name="connection", scope="module")
+def connection_fixture(engine: Engine) -> Generator[Connection, None, None]:
+    """Connection whose transaction holds the data seeded once for a test module."""
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    yield connection
+
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="module")
+def seed_session(connection: Connection) -> Generator[Session, None, None]:
+    """Session for data seeded once and shared by all the tests of a module."""
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+    yield session
+
+    session.close()
 
+
+@pytest.fixture(name="session")
+def session_fixture(connection: Connection):
+    """Session running inside a savepoint that is rolled back after the test."""
+    savepoint = connection.begin_nested()
+    # Commits from the code under test only release savepoints nested in this one
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+    yield session
+
+    session.close()
+    if savepoint.is_active:
+        savepoint.rollback()
+
+
+@pytest.fixture
+def query_counter(engine: Engine) -> Generator[list[str], None, None]:
+    """Collect the SQL statements sent to the database while the fixture is active."""
+    statements: list[str] = []
+
+    def record_statement(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ):
+        # Savepoints come from the test session fixture, not from the code under test
+        if not statement.startswith(SAVEPOINT_STATEMENTS):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record_statement)
+
+
+def get_session_override() -> Session:
+    return current_session.get()
+
+
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """Client shared by all tests, the app gets its session from current_session."""
     app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, app_client: TestClient):
+    token = current_session.set(session)
+    yield app_client
+    current_session.reset(token)
@@ -8,7 +8,6 @@ from sqlmodel import Session
 
 
 from pangbank_api.models import Collection, CollectionRelease, TaxonomySource
-from ..mock_session import session_fixture, client_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
 
 
 @pytest.fixture
@@ -1,77 +1,95 @@
+from typing import Any
+
 import pytest
 from fastapi.testclient import TestClient
 from httpx import Response
+from sqlalchemy import insert
 from sqlmodel import Session
 
 
-from pangbank_api.models import GenomeSource, Taxon, Genome, TaxonomySource
-from ..mock_session import session_fixture, client_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
+from pangbank_api.models import (
+    GenomeSource,
+    GenomeTaxonLink,
+    Taxon,
+    Genome,
+    TaxonomySource,
+)
+from ..mock_data import insert_rows
 
 
-@pytest.fixture
-def mock_data(
-    session: Session,
-):
-    # Create mock Pangenome and related models for the tests
+@pytest.fixture(scope="module")
+def mock_data(seed_session: Session):
+    # Create mock Pangenome and related models once, the tests only read them
 
-    taxonomy_source = TaxonomySource(name="TaxSouce", ranks="Domain;Family;Species")
-
-    taxon_bact = Taxon(
-        name="d__Bacteria", rank="Domain", depth=0, taxonomy_source=taxonomy_source
-    )
-    taxon_actino = Taxon(
-        name="p__Actinobacteria",
-        rank="Phylum",
-        depth=1,
-        taxonomy_source=taxonomy_source,
+    taxonomy_source_ids = insert_rows(
+        seed_session,
+        TaxonomySource,
+        "name",
+        [{"name": "TaxSouce", "ranks": "Domain;Family;Species"}],
     )
-    taxon_archaea = Taxon(
-        name="d__Archaea", rank="Domain", depth=0, taxonomy_source=taxonomy_source
-    )
-
-    taxonomy_source2 = TaxonomySource(name="TaxSouce", ranks="Domain;Family;Species")
 
-    taxon_bact_2 = Taxon(
-        name="Bacteria", rank="Domain", depth=0, taxonomy_source=taxonomy_source2
+    taxon_ids = insert_rows(
+        seed_session,
+        Taxon,
+        "name",
+        [
+            {
+                "name": name,
+                "rank": rank,
+                "depth": depth,
+                "taxonomy_source_id": taxonomy_source_ids["TaxSouce"],
+            }
+            for name, rank, depth in [
+                ("d__Bacteria", "Domain", 0),
+                ("p__Actinobacteria", "Phylum", 1),
+                ("d__Archaea", "Domain", 0),
+                ("Bacteria", "Domain", 0),
+            ]
+        ],
     )
 
-    genome_source1 = GenomeSource(name="GenomeSource1")
-    genome_source2 = GenomeSource(name="GenomeSource2")
-
-    genomeA = Genome(
-        name="GenomeArch", taxa=[taxon_archaea], genome_source=genome_source1
-    )
-    genomeB = Genome(
-        name="GenomeB", taxa=[taxon_bact, taxon_bact_2], genome_source=genome_source1
-    )
-    genomeB2 = Genome(
-        name="GenomeB2", taxa=[taxon_bact_2], genome_source=genome_source2
+    genome_source_ids = insert_rows(
+        seed_session,
+        GenomeSource,
+        "name",
+        [{"name": "GenomeSource1"}, {"name": "GenomeSource2"}],
     )
 
-    genomeActino = Genome(
-        name="GenomeActino",
-        taxa=[taxon_bact, taxon_actino],
-        genome_source=genome_source1,
+    genome_ids = insert_rows(
+        seed_session,
+        Genome,
+        "name",
+        [
+            {"name": name, "genome_source_id": genome_source_ids[genome_source]}
+            for name, genome_source in [
+                ("GenomeArch", "GenomeSource1"),
+                ("GenomeB", "GenomeSource1"),
+                ("GenomeB2", "GenomeSource2"),
+                ("GenomeActino", "GenomeSource1"),
+            ]
+        ],
     )
 
-    session.add_all(
+    seed_session.execute(
+        insert(GenomeTaxonLink),
         [
-            genome_source1,
-            genome_source2,
-            taxon_bact,
-            taxon_actino,
-            taxon_archaea,
-            taxon_bact_2,
-            genomeA,
-            genomeB,
-            genomeB2,
-            genomeActino,
-        ]
+            {"genome_id": genome_ids[genome], "taxon_id": taxon_ids[taxon]}
+            for genome, taxon in [
+                ("GenomeArch", "d__Archaea"),
+                ("GenomeB", "d__Bacteria"),
+                ("GenomeB", "Bacteria"),
+                ("GenomeB2", "Bacteria"),
+                ("GenomeActino", "d__Bacteria"),
+                ("GenomeActino", "p__Actinobacteria"),
+            ]
+        ],
     )
-    session.commit()
+    seed_session.commit()
 
 
-def test_read_genomes_success(client: TestClient, session: Session, mock_data: None):
+def test_read_genomes_success(
+    client: TestClient, session: Session, mock_data: None, query_counter: list[str]
+):
     """
     Test to ensure that the /genomes/ endpoint returns a list of genomes.
     """
@@ -85,81 +103,91 @@ def test_read_genomes_success(client: TestClient, session: Session, mock_data: N
     assert len(data) > 0
     assert "name" in data[0]
     assert "taxonomies" in data[0]
+    # Related rows are loaded per relationship, not per genome (no N+1 queries)
+    assert len(query_counter) <= 4, query_counter
 
 
-def test_read_genomes_filter_by_name(
-    client: TestClient, session: Session, mock_data: None
+# Genome filters and the names of the mock_data genomes they select
+GENOME_FILTER_CASES = [
+    pytest.param({"genome_name": "GenomeArch"}, {"GenomeArch"}, id="by_name"),
+    # Two genomes have the taxon "Bacteria"
+    pytest.param({"taxon_name": "Bacteria"}, {"GenomeB", "GenomeB2"}, id="by_taxon"),
+    # Two genomes have the taxon "Bacteria" and one has "d__Bacteria"
+    pytest.param(
+        {"taxon_name": "Bacteria", "substring_taxon_match": True},
+        {"GenomeB", "GenomeB2", "GenomeActino"},
+        id="by_substring_match_taxon",
+    ),
+]
+
+
+@pytest.mark.parametrize("params, expected_names", GENOME_FILTER_CASES)
+def test_read_genomes_filter(
+    client: TestClient,
+    session: Session,
+    mock_data: None,
+    params: dict[str, Any],
+    expected_names: set[str],
 ):
     """
-    Test the /genomes/ endpoint with a filter on genome name.
+    Test the /genomes/ endpoint with filters on genome and taxon names.
     """
-    # Arrange
-    genome_name = "GenomeArch"
-
     # Act
-    response = client.get(f"/genomes/?genome_name={genome_name}")
+    response = client.get("/genomes/", params=params)
 
     # Assert
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 1
-    assert data[0]["name"] == genome_name
+    assert {genome["name"] for genome in data} == expected_names
+    assert len(data) == len(expected_names)
 
 
-def test_read_genomes_filter_by_taxon(
-    client: TestClient, session: Session, mock_data: None
+@pytest.mark.parametrize("params, expected_names", GENOME_FILTER_CASES)
+def test_count_genomes_filter(
+    client: TestClient,
+    session: Session,
+    mock_data: None,
+    params: dict[str, Any],
+    expected_names: set[str],
 ):
     """
-    Test the /genomes/ endpoint with a filter on genome name.
+    Test the /genomes/count/ endpoint returns the number of filtered genomes.
     """
-    # Arrange
-    taxon_name = "Bacteria"
-
     # Act
-    response = client.get(f"/genomes/?taxon_name={taxon_name}")
+    response = client.get("/genomes/count/", params=params)
 
     # Assert
     assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 2  # Two genomes have the taxon "Bacteria"
-
+    assert response.json() == len(expected_names)
 
-def test_read_genomes_filter_by_substring_match_taxon(
-    client: TestClient, session: Session, mock_data: None
-):
-    """
-    Test the /genomes/ endpoint with a filter on genome name.
-    """
-    # Arrange
-    taxon_name = "Bacteria"
 
-    # Act
-    response = client.get(
-        f"/genomes/?taxon_name={taxon_name}&substring_taxon_match=true"
-    )
+def test_count_genomes(client: TestClient, session: Session, mock_data: None):
+    response = client.get("/genomes/count/")
 
-    # Assert
     assert response.status_code == 200
-    data = response.json()
-    # Two genomes have the taxon "Bacteria" and one has "d__Bacteria"
-    assert len(data) == 3
+    assert response.json() == 4
 
 
 def test_read_genomes_pagination(client: TestClient, session: Session, mock_data: None):
     """
-    Test pagination by limiting the number of results.
+    Test keyset pagination: each page starts after the last id of the previous one.
     """
     # Act
-    response = client.get("/genomes/?limit=1&offset=0")
+    first_page = client.get("/genomes/", params={"limit": 1})
+    last_id = first_page.json()[-1]["id"]
+    next_page = client.get("/genomes/", params={"limit": 1, "after_id": last_id})
 
     # Assert
-    assert response.status_code == 200
-    data = response.json()
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 1
+    assert next_page.status_code == 200
+    data = next_page.json()
     assert len(data) == 1
+    assert data[0]["id"] > last_id
 
 
 def test_get_genome_by_id_success(
-    client: TestClient, session: Session, mock_data: None
+    client: TestClient, session: Session, mock_data: None, query_counter: list[str]
 ):
     """
     Test fetching a genome by its ID.
@@ -175,6 +203,8 @@ def test_get_genome_by_id_success(
     data = response.json()
     assert "name" in data
     assert "taxonomies" in data
+    # Taxa, taxonomy sources and genome source are joined into the genome query
+    assert len(query_counter) == 1, query_counter
 
 
 def test_get_genome_by_id_not_found(client: TestClient, session: Session):
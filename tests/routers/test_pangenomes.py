@@ -1,161 +1,162 @@
 # tests/test_pangenomes.py
+"""Tests of the pangenome router, pangenome listing and file downloads.
+
+PYTEST_DONT_REWRITE: assertions compare status codes, headers and response
+bodies. As asserts are not rewritten here, each check passes what it inspects
+as its message: the body (parsed once) or, for streamed files, the headers.
+"""
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
-from unittest.mock import patch
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import insert
 from sqlmodel import Session
 
 from pangbank_api.models import (
     CollectionRelease,
     Pangenome,
+    PangenomeTaxonLink,
     Taxon,
     TaxonomySource,
     Collection,
 )
-from tests.mock_session import session_fixture, client_fixture  # type: ignore # noqa: F401 # pylint: disable=unused-import
+from tests.mock_data import PANGENOME_METRIC_DATA, insert_rows
+
+
+@pytest.fixture(scope="session")
+def pangenome_files_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory holding empty pangenome files, created once for the test session."""
+    files_dir = tmp_path_factory.mktemp("pangenomes")
+
+    for file_name in ["PangenomeOne.h5", "PangenomeTwo.h5", "PangenomeThree.h5"]:
+        (files_dir / file_name).touch()
+
+    return files_dir
 
 
-@pytest.fixture
-def collection_release_data(tmp_path: Path) -> dict[str, Any]:
+@pytest.fixture(scope="module")
+def collection_release_data(pangenome_files_dir: Path) -> dict[str, Any]:
     return {
-        "version": "1.0.0",
         "ppanggolin_version": "2.3.4",
         "pangbank_wf_version": "1.2.3",
-        "pangenomes_directory": tmp_path.as_posix(),
+        "pangenomes_directory": pangenome_files_dir.as_posix(),
         "release_note": "Initial release.",
         "mash_sketch": "sketch/path",
         "mash_version": "2.0",
         "date": datetime.now(),
-        "collection_id": 1,
-        "taxonomy_source_id": 1,
         "mash_sketch_md5sum": "1234567890abcdef",
     }
 
 
-@pytest.fixture(name="release")
-def create_collection_release(
-    session: Session, collection_release_data: dict[str, Any]
-) -> CollectionRelease:
-    release = CollectionRelease(**collection_release_data)
-    collection = Collection(
-        name="Collection 1",
-    )
-    release.collection = collection
-    session.add(release)
-    session.add(collection)
-    session.commit()
-    session.refresh(release)
-    return release
-
-
-@pytest.fixture
-def pangenome_metric_data(session: Session) -> Dict[str, Any]:
-    # Sample data as dictionaries
-    metric1: Dict[str, Any] = {
-        "gene_count": 1000,
-        "genome_count": 50,
-        "family_count": 200,
-        "edge_count": 1500,
-        "persistent_family_count": 100,
-        "persistent_family_min_genome_frequency": 0.8,
-        "persistent_family_max_genome_frequency": 1.0,
-        "persistent_family_std_genome_frequency": 0.05,
-        "persistent_family_mean_genome_frequency": 0.9,
-        "shell_family_count": 50,
-        "shell_family_min_genome_frequency": 0.2,
-        "shell_family_max_genome_frequency": 0.8,
-        "shell_family_std_genome_frequency": 0.15,
-        "shell_family_mean_genome_frequency": 0.5,
-        "cloud_family_count": 50,
-        "cloud_family_min_genome_frequency": 0.0,
-        "cloud_family_max_genome_frequency": 0.2,
-        "cloud_family_std_genome_frequency": 0.05,
-        "cloud_family_mean_genome_frequency": 0.1,
-        "partition_count": 10,
-        "rgp_count": 5,
-        "spot_count": 3,
-        "module_count": 15,
-        "family_in_module_count": 50,
-        "mean_completeness": 0.95,
-        "mean_contamination": 0.95,
-        "mean_fragmentation": 0.95,
-        "mean_exact_core_families_count_per_genome": 40.0,
-        "mean_soft_core_families_count_per_genome": 40.0,
-        "mean_persistent_families_count_per_genome": 40.0,
-        "mean_shell_families_count_per_genome": 40.0,
-        "mean_cloud_families_count_per_genome": 40.0,
-    }
-
-    # Return as list of dicts
-    return metric1  # [metric1, metric2]
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_data(
-    session: Session,
-    pangenome_metric_data: Dict[str, Any],
-    release: CollectionRelease,
-    tmp_path: Path,
+    seed_session: Session,
+    collection_release_data: dict[str, Any],
 ):
-    # Create test pangenomes
-    taxonomy_source = TaxonomySource(name="NCBI", ranks="Domain")
-    taxa = [
-        Taxon(name="Bacteria", rank="Domain", depth=0, taxonomy_source=taxonomy_source)
+    # Create test pangenomes once, the tests only read them. Each pangenome has
+    # its own release, taxon and taxonomy source, so loading their relationships
+    # lazily costs more queries with every pangenome.
+    pangenomes = [
+        # name, file name, release version, taxon name, taxonomy source name
+        ("Pangenome_test", "PangenomeOne.h5", "1.0.0", "Bacteria", "NCBI"),
+        ("Pangenome_test2", "PangenomeTwo.h5", "2.0.0", "d__Bacteria", "GTDB"),
+        ("Pangenome_test3", "PangenomeThree.h5", "3.0.0", "Archaea", "Custom"),
     ]
-    pangneom1_file = tmp_path / "PangenomeOne.h5"
-    pangneom1_file.write_text("pangenome content")
-
-    pangneom2_file = tmp_path / "PangenomeTwo.h5"
-    pangneom2_file.write_text("pangenome content")
-
-    pangenome1 = Pangenome(
-        **pangenome_metric_data,
-        file_name=pangneom1_file.name,
-        annotation_source="PPANGGOLIN",
-        collection_release=release,
-        taxa=taxa,
-        name="Pangenome_test",
-        file_md5sum="1a",
+
+    taxonomy_source_ids = insert_rows(
+        seed_session,
+        TaxonomySource,
+        "name",
+        [{"name": source, "ranks": "Domain"} for *_, source in pangenomes],
+    )
+    taxon_ids = insert_rows(
+        seed_session,
+        Taxon,
+        "name",
+        [
+            {
+                "name": taxon,
+                "rank": "Domain",
+                "depth": 0,
+                "taxonomy_source_id": taxonomy_source_ids[source],
+            }
+            for *_, taxon, source in pangenomes
+        ],
     )
-    pangenome2 = Pangenome(
-        **pangenome_metric_data,
-        file_name=pangneom2_file.name,
-        annotation_source="PPANGGOLIN",
-        collection_release=release,
-        name="Pangenome_test2",
-        file_md5sum="2a",
-        taxa=taxa,
+    collection_ids = insert_rows(
+        seed_session, Collection, "name", [{"name": "Collection 1"}]
+    )
+    release_ids = insert_rows(
+        seed_session,
+        CollectionRelease,
+        "version",
+        [
+            {
+                **collection_release_data,
+                "version": version,
+                "collection_id": collection_ids["Collection 1"],
+                "taxonomy_source_id": taxonomy_source_ids[source],
+            }
+            for _, _, version, _, source in pangenomes
+        ],
     )
 
-    session.add_all([pangenome1, pangenome2])
-    session.commit()
+    pangenome_ids = insert_rows(
+        seed_session,
+        Pangenome,
+        "name",
+        [
+            {
+                **PANGENOME_METRIC_DATA,
+                "file_name": file_name,
+                "annotation_source": "PPANGGOLIN",
+                "collection_release_id": release_ids[version],
+                "name": name,
+                "file_md5sum": f"{i}a",
+            }
+            for i, (name, file_name, version, _, _) in enumerate(pangenomes, 1)
+        ],
+    )
+    seed_session.execute(
+        insert(PangenomeTaxonLink),
+        [
+            {"pangenome_id": pangenome_ids[name], "taxon_id": taxon_ids[taxon]}
+            for name, _, _, taxon, _ in pangenomes
+        ],
+    )
+    seed_session.commit()
 
 
-def test_get_pangenomes(client: TestClient, test_data: None):
+def test_get_pangenomes(
+    client: TestClient, test_data: None, query_counter: list[str]
+):
     response = client.get("/pangenomes/")
 
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 2
-    assert data[0]["genome_count"] == 50
+    assert response.status_code == 200, response.text
+    # Checked on the raw body, the payload carries ~30 metrics per pangenome
+    assert response.content.count(b'"file_md5sum"') == 3, response.content
+    assert b'"genome_count":50,' in response.content, response.content
+    # One query for the pangenomes and one per eager loaded relationship,
+    # whatever the number of pangenomes (no N+1 queries)
+    assert len(query_counter) == 6, query_counter
 
 
 def test_get_existing_pangenome(client: TestClient, test_data: None):
     # Existing pangenome
     response = client.get("/pangenomes/1")
-    assert response.status_code == 200
+    assert response.status_code == 200, response.text
     data = response.json()
-    assert data["genome_count"] == 50
+    assert data["genome_count"] == 50, data
 
 
 def test_get_non_existing_pangenome(client: TestClient):
     # Non-existent pangenome
     response = client.get("/pangenomes/999")
-    assert response.status_code == 404
-    assert response.json()["detail"] == "Pangenome not found"
+    assert response.status_code == 404, response.text
+    data = response.json()
+    assert data["detail"] == "Pangenome not found", data
 
 
 def test_get_pangenome_file_success(
@@ -164,14 +165,14 @@ def test_get_pangenome_file_success(
     # Arrange
     pangenome_id = 1  # Assuming this ID exists in test_data
 
-    response = client.get(f"/pangenomes/{pangenome_id}/file")
-
-    # Assert
-    assert response.status_code == 200
-    assert (
-        response.headers["content-disposition"]
-        == 'attachment; filename="Pangenome_test_id1.h5"'
-    )
+    # Only the headers are checked, so the file body is never read
+    with client.stream("GET", f"/pangenomes/{pangenome_id}/file") as response:
+        # Assert
+        assert response.status_code == 200, response.headers
+        assert (
+            response.headers["content-disposition"]
+            == 'attachment; filename="Pangenome_test_id1.h5"'
+        ), response.headers
 
 
 def test_get_pangenome_file_not_found(client: TestClient, session: Session):
@@ -182,21 +183,29 @@ def test_get_pangenome_file_not_found(client: TestClient, session: Session):
     response = client.get(f"/pangenomes/{pangenome_id}/file")
 
     # Assert
-    assert response.status_code == 404
-    assert response.json() == {"detail": "Pangenome not found"}
+    assert response.status_code == 404, response.text
+    data = response.json()
+    assert data == {"detail": "Pangenome not found"}, data
 
 
 def test_get_pangenome_file_not_exists(
-    client: TestClient, session: Session, test_data: None
+    client: TestClient,
+    session: Session,
+    test_data: None,
+    monkeypatch: pytest.MonkeyPatch,
 ):
     # Arrange
     pangenome_id = 1  # Assuming this ID exists in test_data
 
     # Mock the file's non-existence
-    with patch("pathlib.Path.exists", return_value=False):
-        # Act
-        response = client.get(f"/pangenomes/{pangenome_id}/file")
+    monkeypatch.setattr(
+        "pangbank_api.routers.pangenomes.file_exists", lambda path: False
+    )
 
-        # Assert
-        assert response.status_code == 404
-        assert "does not exists" in response.json()["detail"]
+    # Act
+    response = client.get(f"/pangenomes/{pangenome_id}/file")
+
+    # Assert
+    assert response.status_code == 404, response.text
+    data = response.json()
+    assert "does not exists" in data["detail"], data